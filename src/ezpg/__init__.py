@@ -1,13 +1,16 @@
 """Simple PostgreSQL connection pool library."""
 
+from ezpg._pipeline import PipelineResult
 from ezpg.async_pool import (
     AsyncDatabasePool,
+    AsyncPipeline,
     close_async_database,
     get_async_db_pool,
     init_async_database,
 )
 from ezpg.sync_pool import (
     SyncDatabasePool,
+    SyncPipeline,
     close_sync_database,
     get_sync_db_pool,
     init_sync_database,
@@ -16,12 +19,16 @@ from ezpg.sync_pool import (
 __all__ = [
     # Async
     "AsyncDatabasePool",
+    "AsyncPipeline",
     "get_async_db_pool",
     "init_async_database",
     "close_async_database",
     # Sync
     "SyncDatabasePool",
+    "SyncPipeline",
     "get_sync_db_pool",
     "init_sync_database",
     "close_sync_database",
+    # Shared
+    "PipelineResult",
 ]
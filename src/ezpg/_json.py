@@ -0,0 +1,32 @@
+"""JSON encoding shared by the async and sync pools."""
+
+import json
+import re
+from typing import Any
+
+import orjson
+
+# orjson only handles integers in [-2**63, 2**64 - 1] and decodes wider ones as
+# lossy floats. Any run of 19+ digits might be such an integer.
+_WIDE_INT_RE = re.compile(r"\d{19}")
+_WIDE_INT_BYTES_RE = re.compile(rb"\d{19}")
+
+
+def json_dumps(value: Any) -> bytes:
+    """Encode a value as UTF-8 JSON, converting non-string keys like ``json.dumps``.
+
+    Falls back to ``json.dumps`` for values orjson rejects, such as integers
+    wider than 64 bits.
+    """
+    try:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+
+def json_loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode JSON, using ``json.loads`` when integers may exceed 64 bits."""
+    pattern = _WIDE_INT_RE if isinstance(data, str) else _WIDE_INT_BYTES_RE
+    if pattern.search(data) is None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
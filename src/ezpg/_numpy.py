@@ -0,0 +1,53 @@
+"""Column-oriented NumPy conversion of query results."""
+
+from collections.abc import Sequence
+from typing import Any
+
+# PostgreSQL type OIDs that map onto a native NumPy dtype
+_NUMPY_DTYPES = {
+    16: "bool",  # bool
+    20: "int64",  # int8
+    21: "int16",  # int2
+    23: "int32",  # int4
+    700: "float32",  # float4
+    701: "float64",  # float8
+    1082: "datetime64[D]",  # date
+    1114: "datetime64[us]",  # timestamp
+}
+
+
+def to_numpy_columns(
+    names: Sequence[str], type_oids: Sequence[int], rows: Sequence[Sequence[Any]]
+) -> dict[str, Any]:
+    """Convert rows into a mapping of column name to NumPy array.
+
+    Columns with a native dtype are converted directly; other columns, and
+    columns containing NULLs, become object arrays.
+
+    Args:
+        names: Column names
+        type_oids: PostgreSQL type OID of each column
+        rows: Result rows
+
+    Returns:
+        Mapping of column name to array
+
+    Raises:
+        ImportError: If numpy is not installed
+    """
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "NumPy result decoding requires numpy. "
+            "Install it with: pip install ezpg[numpy]"
+        ) from e
+
+    columns = {}
+    for index, (name, type_oid) in enumerate(zip(names, type_oids)):
+        values = [row[index] for row in rows]
+        dtype = _NUMPY_DTYPES.get(type_oid, object)
+        if dtype is not object and any(value is None for value in values):
+            dtype = object
+        columns[name] = np.fromiter(values, dtype=dtype, count=len(values))
+    return columns
@@ -0,0 +1,48 @@
+"""Result handle shared by the async and sync pipelines."""
+
+from typing import Any
+
+_PENDING = object()
+
+
+class PipelineResult:
+    """Rows of a query queued on a pipeline, available once the pipeline block exits.
+
+    Results only arrive when the pipeline is flushed on exit, so reading (or
+    awaiting) them inside the block raises instead of waiting forever.
+    """
+
+    __slots__ = ("_rows", "_error")
+
+    def __init__(self) -> None:
+        self._rows: Any = _PENDING
+        self._error = (
+            "Pipeline results are only available after the pipeline block exits"
+        )
+
+    def done(self) -> bool:
+        """Return whether the rows have been received."""
+        return self._rows is not _PENDING
+
+    def result(self) -> list:
+        """Return the rows of the query.
+
+        Raises:
+            RuntimeError: If the pipeline has not been flushed, or was discarded
+        """
+        if self._rows is _PENDING:
+            raise RuntimeError(self._error)
+        return self._rows
+
+    def __await__(self) -> Any:
+        raise RuntimeError(
+            "Pipeline results can't be awaited; call result() after the pipeline "
+            "block exits"
+        )
+
+    def _set_result(self, rows: list) -> None:
+        self._rows = rows
+
+    def _discard(self) -> None:
+        if self._rows is _PENDING:
+            self._error = "Pipeline was discarded before this query's results arrived"
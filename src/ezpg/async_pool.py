@@ -1,20 +1,221 @@
 """Async database connection and pool management using asyncpg."""
 
-import json
+import asyncio
 import logging
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
-from typing import Any
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, NoReturn
 
 import asyncpg
 import asyncpg_listen
+from asyncpg.transaction import Transaction
+
+from ezpg._json import json_dumps, json_loads
+from ezpg._numpy import to_numpy_columns
+from ezpg._pipeline import PipelineResult
 
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(value: Any) -> str:
+    """Encode a value as JSON text (asyncpg text codecs expect ``str``)."""
+    return json_dumps(value).decode()
+
+
+def _jsonb_encode_binary(value: Any) -> bytes:
+    """Encode a value in the JSONB binary wire format (version byte + UTF-8 JSON)."""
+    return b"\x01" + json_dumps(value)
+
+
+def _jsonb_decode_binary(data: bytes) -> Any:
+    """Decode a JSONB binary wire value, skipping the leading version byte."""
+    return json_loads(memoryview(data)[1:])
+
+
+# Wraps a query so the server renders its rows as a UTF-8 JSON array (bytea). The
+# newline keeps a trailing ``--`` comment in the query from swallowing ``) AS t``
+_JSON_AGG_QUERY = (
+    "SELECT convert_to(coalesce(json_agg(t), '[]')::text, 'UTF8') FROM ({}\n) AS t"
+)
+
+# Codecs registered on every new connection, as (typename, encoder, decoder, format)
+_TEXT_JSON_CODECS = (
+    ("json", _json_dumps, json_loads, "text"),
+    ("jsonb", _json_dumps, json_loads, "text"),
+)
+_BINARY_JSONB_CODECS = (
+    ("json", _json_dumps, json_loads, "text"),
+    ("jsonb", _jsonb_encode_binary, _jsonb_decode_binary, "binary"),
+)
+
+
+class _UninitializedPool:
+    """Stands in for the asyncpg pool until ``initialize()`` replaces it."""
+
+    __slots__ = ()
+
+    def acquire(self) -> NoReturn:
+        raise RuntimeError("Async database pool not initialized")
+
+
+_UNINITIALIZED = _UninitializedPool()
+
+
+class _AcquireContext:
+    """Holds a pooled connection for the duration of an ``async with`` block."""
+
+    __slots__ = ("_pool", "_conn")
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+        self._conn: asyncpg.Connection | None = None
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        self._conn = await self._pool.acquire()
+        return self._conn
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        conn, self._conn = self._conn, None
+        await self._pool.release(conn)
+
+
+class _TransactionContext:
+    """Holds a pooled connection inside a transaction for an ``async with`` block."""
+
+    __slots__ = ("_pool", "_conn", "_transaction")
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+        self._conn: asyncpg.Connection | None = None
+        self._transaction: Transaction | None = None
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        conn = await self._pool.acquire()
+        try:
+            transaction = conn.transaction()
+            await transaction.start()
+        except BaseException:
+            await self._pool.release(conn)
+            raise
+        self._conn, self._transaction = conn, transaction
+        return conn
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, *_: Any) -> None:
+        conn, self._conn = self._conn, None
+        transaction, self._transaction = self._transaction, None
+        try:
+            if exc_type is None:
+                await transaction.commit()
+            else:
+                await transaction.rollback()
+        finally:
+            await self._pool.release(conn)
+
+
+class AsyncPipeline:
+    """Queues commands and runs them in order over a single connection on flush.
+
+    asyncpg allows only one operation in flight per connection, so queued
+    queries still run one round-trip at a time. The exception is a run of
+    consecutive ``execute()`` calls with the same query, each passing
+    arguments, which is sent as a single ``executemany()`` that asyncpg
+    pipelines with one trailing sync.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self._conn = conn
+        self._queue: list[tuple[str, tuple, PipelineResult | None]] = []
+
+    def execute(self, query: str, *args) -> None:
+        """Queue a command (INSERT/UPDATE/DELETE).
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+        """
+        self._queue.append((query, args, None))
+
+    def fetch(self, query: str, *args) -> PipelineResult:
+        """Queue a query whose rows are delivered when the pipeline is flushed.
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+
+        Returns:
+            A handle whose ``result()`` holds the records once the block exits
+        """
+        result = PipelineResult()
+        self._queue.append((query, args, result))
+        return result
+
+    async def flush(self) -> None:
+        """Send all queued queries in order."""
+        queue, self._queue = self._queue, []
+        try:
+            i = 0
+            while i < len(queue):
+                query, args, result = queue[i]
+                if result is not None:
+                    result._set_result(await self._conn.fetch(query, *args))
+                    i += 1
+                    continue
+
+                # Parameterless commands aren't grouped: executemany() would run
+                # them as a prepared statement, which rejects multi-statement
+                # strings that execute() accepts
+                j = i + 1
+                while (
+                    args
+                    and j < len(queue)
+                    and queue[j][0] == query
+                    and queue[j][1]
+                    and queue[j][2] is None
+                ):
+                    j += 1
+                if j - i == 1:
+                    await self._conn.execute(query, *args)
+                else:
+                    await self._conn.executemany(
+                        query, [item[1] for item in queue[i:j]]
+                    )
+                i = j
+        except BaseException:
+            self._discard(queue)
+            raise
+
+    def discard(self) -> None:
+        """Drop all queued queries without sending them."""
+        queue, self._queue = self._queue, []
+        self._discard(queue)
+
+    @staticmethod
+    def _discard(queue: list[tuple[str, tuple, PipelineResult | None]]) -> None:
+        for _, _, result in queue:
+            if result is not None:
+                result._discard()
+
+
 class AsyncDatabasePool:
     """Manages an async connection pool to PostgreSQL database using asyncpg."""
 
+    __slots__ = (
+        "host",
+        "port",
+        "database",
+        "user",
+        "password",
+        "min_connections",
+        "max_connections",
+        "statement_cache_size",
+        "idle_timeout",
+        "binary_json",
+        "loop",
+        "_pool",
+        "_loop",
+        "_listen_connect_func",
+    )
+
     def __init__(
         self,
         host: str,
@@ -24,6 +225,10 @@ class AsyncDatabasePool:
         password: str,
         min_connections: int = 1,
         max_connections: int = 10,
+        statement_cache_size: int = 1024,
+        idle_timeout: float = 300.0,
+        binary_json: bool = True,
+        loop: asyncio.AbstractEventLoop | None = None,
     ):
         """Initialize async database connection pool.
 
@@ -35,6 +240,15 @@ class AsyncDatabasePool:
             password: Database password
             min_connections: Minimum pool size
             max_connections: Maximum pool size
+            statement_cache_size: Number of prepared statements cached per connection.
+                Set to 0 when connecting through pgbouncer in transaction
+                pooling mode
+            idle_timeout: Seconds a connection may stay idle before it is closed
+            binary_json: Exchange JSONB values in binary format. Disable to have
+                the server render JSONB as text (e.g. to preserve its exact
+                textual representation)
+            loop: Event loop the pool must be initialized on (defaults to the
+                running loop); initialize() raises if awaited on another loop
         """
         self.host = host
         self.port = port
@@ -43,10 +257,26 @@ class AsyncDatabasePool:
         self.password = password
         self.min_connections = min_connections
         self.max_connections = max_connections
-        self._pool: asyncpg.Pool | None = None
+        self.statement_cache_size = statement_cache_size
+        self.idle_timeout = idle_timeout
+        self.binary_json = binary_json
+        self.loop = loop
+        self._pool: asyncpg.Pool | _UninitializedPool = _UNINITIALIZED
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listen_connect_func: asyncpg_listen.ConnectFunc | None = None
 
     async def initialize(self) -> None:
-        """Initialize the async connection pool."""
+        """Initialize the async connection pool.
+
+        Raises:
+            RuntimeError: If ``loop`` was given and isn't the running event loop
+        """
+        running_loop = asyncio.get_running_loop()
+        if self.loop is not None and self.loop is not running_loop:
+            raise RuntimeError(
+                "AsyncDatabasePool.initialize() must run on the loop passed as "
+                "loop=; await it from inside that loop."
+            )
         try:
             self._pool = await asyncpg.create_pool(
                 host=self.host,
@@ -57,8 +287,15 @@ class AsyncDatabasePool:
                 min_size=self.min_connections,
                 max_size=self.max_connections,
                 command_timeout=60,
+                statement_cache_size=self.statement_cache_size,
+                # Pooled connections are long-lived; keep prepared statements
+                # until evicted by the LRU rather than expiring them on a timer
+                max_cached_statement_lifetime=0,
+                max_inactive_connection_lifetime=self.idle_timeout,
                 init=self._setup_connection,
+                loop=self.loop,
             )
+            self._loop = running_loop
             logger.info(
                 f"Async database pool initialized for {self.database} "
                 f"at {self.host}:{self.port}"
@@ -71,45 +308,43 @@ class AsyncDatabasePool:
         """Set up each connection with custom type codecs.
 
         This is called for each connection in the pool when it's created.
+        asyncpg resolves ``pg_catalog`` builtin type names locally, so
+        registering these codecs costs no round-trips to the server.
         """
-        # Set up JSON codec for automatic JSON/JSONB handling
-        await conn.set_type_codec(
-            "json", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-        )
-
-        await conn.set_type_codec(
-            "jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
-        )
+        codecs = _BINARY_JSONB_CODECS if self.binary_json else _TEXT_JSON_CODECS
+        for typename, encoder, decoder, codec_format in codecs:
+            await conn.set_type_codec(
+                typename,
+                encoder=encoder,
+                decoder=decoder,
+                schema="pg_catalog",
+                format=codec_format,
+            )
 
     async def close(self) -> None:
         """Close all connections in the pool."""
-        if self._pool:
+        if self._pool is not _UNINITIALIZED:
             await self._pool.close()
             logger.info("Async database pool closed")
 
-    @asynccontextmanager
-    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+    def acquire(self) -> AbstractAsyncContextManager[asyncpg.Connection]:
         """Acquire a connection from the pool.
 
-        Yields:
-            An async database connection that will be returned to the pool
+        Returns:
+            An async context manager yielding a connection that will be
+            returned to the pool
 
         Raises:
             RuntimeError: If pool is not initialized
             asyncpg.PostgresError: On database errors
         """
-        if not self._pool:
-            raise RuntimeError("Async database pool not initialized")
+        return _AcquireContext(self._pool)
 
-        async with self._pool.acquire() as conn:
-            yield conn
-
-    @asynccontextmanager
-    async def transaction(self) -> AsyncIterator[asyncpg.Connection]:
+    def transaction(self) -> AbstractAsyncContextManager[asyncpg.Connection]:
         """Execute database operations in a transaction.
 
-        Yields:
-            An async database connection within a transaction context
+        Returns:
+            An async context manager yielding a connection within a transaction
 
         Example:
             async with db_pool.transaction() as conn:
@@ -117,9 +352,33 @@ class AsyncDatabasePool:
                 await conn.execute("UPDATE ...")
                 # Automatically commits on success, rolls back on exception
         """
-        async with self.acquire() as conn:
-            async with conn.transaction():
-                yield conn
+        return _TransactionContext(self._pool)
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[AsyncPipeline]:
+        """Queue several queries and run them over one connection in a transaction.
+
+        Only runs of consecutive ``execute()`` calls with the same query, each
+        passing arguments, are batched into one round-trip; see ``AsyncPipeline``.
+
+        Yields:
+            A pipeline whose queued queries are flushed when the block exits
+
+        Example:
+            async with db_pool.pipeline() as pipe:
+                for item in items:
+                    pipe.execute("INSERT INTO ...", item)
+                totals = pipe.fetch("SELECT ...")
+            rows = totals.result()
+        """
+        async with self.transaction() as conn:
+            pipe = AsyncPipeline(conn)
+            try:
+                yield pipe
+            except BaseException:
+                pipe.discard()
+                raise
+            await pipe.flush()
 
     async def execute(
         self, query: str, *args, timeout: float | None = None
@@ -134,21 +393,70 @@ class AsyncDatabasePool:
         Returns:
             Status string from the query
         """
-        async with self.acquire() as conn:
-            return await conn.execute(query, *args, timeout=timeout or 60.0)
+        pool = self._pool
+        conn = await pool.acquire()
+        try:
+            return await conn.execute(query, *args, timeout=timeout)
+        finally:
+            await pool.release(conn)
 
     async def executemany(
-        self, query: str, args: list[tuple], timeout: float | None = None
+        self,
+        query: str,
+        args: list[tuple],
+        timeout: float | None = None,
+        batch_size: int = 1000,
     ) -> None:
         """Execute a command multiple times.
 
+        asyncpg already pipelines all parameter sets over the connection in
+        buffered batches with a single trailing sync, so no client-side
+        batching is needed.
+
         Args:
             query: SQL query to execute
             args: List of parameter tuples
             timeout: Query timeout in seconds
+            batch_size: Rows per multi-row INSERT (only used by the sync pool)
+        """
+        pool = self._pool
+        conn = await pool.acquire()
+        try:
+            await conn.executemany(query, args, timeout=timeout)
+        finally:
+            await pool.release(conn)
+
+    async def copy_records(
+        self,
+        table: str,
+        records: Iterable[tuple],
+        columns: list[str] | None = None,
+        schema_name: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """Bulk load records into a table using COPY.
+
+        asyncpg uses binary COPY, so columns with text codecs (``json``, or
+        ``jsonb`` with ``binary_json=False``) are not supported.
+
+        Args:
+            table: Target table name
+            records: Iterable of row tuples
+            columns: Target column names (defaults to all columns)
+            schema_name: Schema of the target table
+            timeout: Query timeout in seconds
+
+        Returns:
+            Status string from the COPY command
         """
         async with self.acquire() as conn:
-            await conn.executemany(query, args, timeout=timeout or 60.0)
+            return await conn.copy_records_to_table(
+                table,
+                records=records,
+                columns=columns,
+                schema_name=schema_name,
+                timeout=timeout,
+            )
 
     async def fetch(
         self, query: str, *args, timeout: float | None = None
@@ -163,8 +471,12 @@ class AsyncDatabasePool:
         Returns:
             List of records
         """
-        async with self.acquire() as conn:
+        pool = self._pool
+        conn = await pool.acquire()
+        try:
             return await conn.fetch(query, *args, timeout=timeout)
+        finally:
+            await pool.release(conn)
 
     async def fetchrow(
         self, query: str, *args, timeout: float | None = None
@@ -179,8 +491,12 @@ class AsyncDatabasePool:
         Returns:
             Single record or None
         """
-        async with self.acquire() as conn:
+        pool = self._pool
+        conn = await pool.acquire()
+        try:
             return await conn.fetchrow(query, *args, timeout=timeout)
+        finally:
+            await pool.release(conn)
 
     async def fetchval(
         self, query: str, *args, column: int = 0, timeout: float | None = None
@@ -196,8 +512,63 @@ class AsyncDatabasePool:
         Returns:
             Single value from the query result
         """
-        async with self.acquire() as conn:
+        pool = self._pool
+        conn = await pool.acquire()
+        try:
             return await conn.fetchval(query, *args, column=column, timeout=timeout)
+        finally:
+            await pool.release(conn)
+
+    async def fetch_json(
+        self, query: str, *args, timeout: float | None = None
+    ) -> bytes:
+        """Execute a query and return its rows as a JSON array.
+
+        The rows are serialized by the server, so the result can be written
+        straight to an HTTP response without building records first.
+
+        The query is wrapped as a subquery, so it must be valid in ``FROM (...)``;
+        statements such as ``INSERT ... RETURNING`` can't be passed.
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+            timeout: Query timeout in seconds
+
+        Returns:
+            UTF-8 encoded JSON array of row objects
+        """
+        wrapped = _JSON_AGG_QUERY.format(query.rstrip().rstrip(";"))
+        return await self.fetchval(wrapped, *args, timeout=timeout)
+
+    async def fetch_numpy(
+        self, query: str, *args, timeout: float | None = None
+    ) -> dict[str, Any]:
+        """Execute a query and return its columns as NumPy arrays.
+
+        Integer, float, boolean, date and timestamp columns get native dtypes;
+        other columns, and columns containing NULLs, are object arrays.
+        Requires the ``numpy`` extra.
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+            timeout: Timeout in seconds for preparing and running the query
+
+        Returns:
+            Mapping of column name to array
+        """
+        async with self.acquire() as conn, asyncio.timeout(timeout):
+            # Go through the connection's statement cache like fetch() does;
+            # the public prepare() always sends a fresh Parse/Describe
+            statement = await conn._prepare(query, use_cache=True)
+            rows = await statement.fetch(*args)
+            # Prepared statements can't be inspected once the connection is released
+            attributes = statement.get_attributes()
+
+        names = [attr.name for attr in attributes]
+        type_oids = [attr.type.oid for attr in attributes]
+        return to_numpy_columns(names, type_oids, rows)
 
     def create_listener(self) -> asyncpg_listen.NotificationListener:
         """Create a notification listener for LISTEN/NOTIFY.
@@ -205,15 +576,17 @@ class AsyncDatabasePool:
         Returns:
             A configured NotificationListener instance
         """
-        return asyncpg_listen.NotificationListener(
-            asyncpg_listen.connect_func(
+        # The connect function only captures connection parameters, so it is
+        # built once and shared by every listener created from this pool
+        if self._listen_connect_func is None:
+            self._listen_connect_func = asyncpg_listen.connect_func(
                 host=self.host,
                 port=self.port,
                 database=self.database,
                 user=self.user,
                 password=self.password,
             )
-        )
+        return asyncpg_listen.NotificationListener(self._listen_connect_func)
 
 
 # Global async database pool instance
@@ -227,13 +600,26 @@ def get_async_db_pool() -> AsyncDatabasePool:
         The async database pool instance
 
     Raises:
-        RuntimeError: If async database pool is not initialized
+        RuntimeError: If async database pool is not initialized or was
+            initialized on a different event loop
     """
-    if not _async_db_pool:
+    pool = _async_db_pool
+    if pool is None:
         raise RuntimeError(
             "Async database pool not initialized. Call init_async_database first."
         )
-    return _async_db_pool
+
+    # A pool outliving its event loop (e.g. across test loops) can't be used
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return pool
+    if pool._loop is not None and pool._loop is not loop:
+        raise RuntimeError(
+            "Async database pool is bound to a different event loop. "
+            "Call close_async_database and init_async_database on this loop."
+        )
+    return pool
 
 
 async def init_async_database(
@@ -244,6 +630,10 @@ async def init_async_database(
     password: str,
     min_connections: int = 1,
     max_connections: int = 10,
+    statement_cache_size: int = 1024,
+    idle_timeout: float = 300.0,
+    binary_json: bool = True,
+    loop: asyncio.AbstractEventLoop | None = None,
 ) -> None:
     """Initialize the global async database pool.
 
@@ -255,9 +645,14 @@ async def init_async_database(
         password: Database password
         min_connections: Minimum pool size
         max_connections: Maximum pool size
+        statement_cache_size: Number of prepared statements cached per connection
+        idle_timeout: Seconds a connection may stay idle before it is closed
+        binary_json: Exchange JSONB values in binary format
+        loop: Event loop the pool must be initialized on (defaults to the
+            running loop); raises RuntimeError if called on another loop
     """
     global _async_db_pool
-    _async_db_pool = AsyncDatabasePool(
+    pool = AsyncDatabasePool(
         host=host,
         port=port,
         database=database,
@@ -265,13 +660,18 @@ async def init_async_database(
         password=password,
         min_connections=min_connections,
         max_connections=max_connections,
+        statement_cache_size=statement_cache_size,
+        idle_timeout=idle_timeout,
+        binary_json=binary_json,
+        loop=loop,
     )
-    await _async_db_pool.initialize()
+    await pool.initialize()
+    _async_db_pool = pool
 
 
 async def close_async_database() -> None:
     """Close the global async database pool."""
     global _async_db_pool
-    if _async_db_pool:
-        await _async_db_pool.close()
-        _async_db_pool = None
+    pool, _async_db_pool = _async_db_pool, None
+    if pool is not None:
+        await pool.close()
@@ -1,24 +1,162 @@
 """Sync database connection and pool management using psycopg3."""
 
-import json
+import atexit
 import logging
-from collections.abc import Iterator
+import re
+from collections.abc import Iterable, Iterator
 from contextlib import contextmanager
-from typing import Any
+from itertools import islice
+from typing import Any, NoReturn
 
-from psycopg import Connection
-from psycopg.types.json import set_json_loads
+from psycopg import Connection, Cursor, sql
+from psycopg.conninfo import make_conninfo
+from psycopg.types.json import set_json_dumps, set_json_loads
 from psycopg_pool import ConnectionPool
 
+from ezpg._json import json_dumps, json_loads
+from ezpg._numpy import to_numpy_columns
+from ezpg._pipeline import PipelineResult
+
 # Configure JSON/JSONB to auto-decode to Python objects (matching asyncpg behavior)
-set_json_loads(json.loads)
+set_json_loads(json_loads)
+set_json_dumps(json_dumps)
 
 logger = logging.getLogger(__name__)
 
+# Single-row ``INSERT ... VALUES (%s, ...)`` that can be rewritten to a multi-row insert
+_INSERT_VALUES_RE = re.compile(
+    r"^\s*(?P<head>INSERT\s+INTO\s+.+?\s+VALUES\s*)"
+    r"(?P<row>\(\s*%s(?:\s*,\s*%s)*\s*\))\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Wraps a query so the server renders its rows as a UTF-8 JSON array (bytea). The
+# newline keeps a trailing ``--`` comment in the query from swallowing ``) AS t``
+_JSON_AGG_QUERY = (
+    "SELECT convert_to(coalesce(json_agg(t), '[]')::text, 'UTF8') FROM ({}\n) AS t"
+)
+
+# PostgreSQL accepts at most this many bind parameters per statement
+_MAX_QUERY_PARAMS = 65535
+
+# Bounds for the pool's background worker threads (psycopg_pool defaults to 3)
+_MIN_NUM_WORKERS = 3
+_MAX_NUM_WORKERS = 16
+
+
+def _multirow_inserts(
+    query: str, args: Iterable[tuple], batch_size: int
+) -> Iterator[tuple[str, list]] | None:
+    """Rewrite a single-row INSERT into multi-row statements.
+
+    Args:
+        query: SQL query to execute
+        args: Parameter tuples, one per row
+        batch_size: Maximum rows per statement
+
+    Returns:
+        An iterator of ``(statement, params)`` pairs, or None if the query
+        isn't a plain ``INSERT ... VALUES (%s, ...)``
+    """
+    match = _INSERT_VALUES_RE.match(query)
+    if match is None:
+        return None
+    head, row = match.group("head", "row")
+    if "%s" in head:
+        # Placeholders outside the VALUES row (e.g. INSERT ... SELECT %s) can't
+        # be repeated per row
+        return None
+
+    size = max(1, min(batch_size, _MAX_QUERY_PARAMS // row.count("%s")))
+    return _batched_rows(head, row, iter(args), size)
+
+
+def _batched_rows(
+    head: str, row: str, rows: Iterator[tuple], size: int
+) -> Iterator[tuple[str, list]]:
+    """Yield one multi-row statement and its flattened params per batch of rows."""
+    while batch := list(islice(rows, size)):
+        yield (
+            head + ",".join([row] * len(batch)),
+            [value for params in batch for value in params],
+        )
+
+
+class _UninitializedPool:
+    """Stands in for the psycopg3 pool until ``initialize()`` replaces it."""
+
+    __slots__ = ()
+
+    def getconn(self) -> NoReturn:
+        raise RuntimeError("Sync database pool not initialized")
+
+    def connection(self) -> NoReturn:
+        raise RuntimeError("Sync database pool not initialized")
+
+
+_UNINITIALIZED = _UninitializedPool()
+
+
+class SyncPipeline:
+    """Sends commands through psycopg3 pipeline mode without waiting for results."""
+
+    def __init__(self, conn: Connection):
+        self._conn = conn
+        self._pending: list[tuple[Cursor, PipelineResult]] = []
+
+    def execute(self, query: str, *args) -> None:
+        """Send a command (INSERT/UPDATE/DELETE).
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+        """
+        self._conn.execute(query, args if args else None)
+
+    def fetch(self, query: str, *args) -> PipelineResult:
+        """Send a query whose rows are delivered when the pipeline is synced.
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+
+        Returns:
+            A handle whose ``result()`` holds the rows once the block exits
+        """
+        cur = self._conn.execute(query, args if args else None)
+        result = PipelineResult()
+        self._pending.append((cur, result))
+        return result
+
+    def flush(self) -> None:
+        """Collect pending fetches once the pipeline has been synced."""
+        pending, self._pending = self._pending, []
+        for cur, result in pending:
+            result._set_result(cur.fetchall())
+
+    def discard(self) -> None:
+        """Drop pending fetches."""
+        pending, self._pending = self._pending, []
+        for _, result in pending:
+            result._discard()
+
 
 class SyncDatabasePool:
     """Manages a sync connection pool to PostgreSQL database using psycopg3."""
 
+    __slots__ = (
+        "host",
+        "port",
+        "database",
+        "user",
+        "password",
+        "min_connections",
+        "max_connections",
+        "statement_cache_size",
+        "idle_timeout",
+        "_pool",
+    )
+
     def __init__(
         self,
         host: str,
@@ -28,6 +166,8 @@ class SyncDatabasePool:
         password: str,
         min_connections: int = 1,
         max_connections: int = 10,
+        statement_cache_size: int = 1024,
+        idle_timeout: float = 300.0,
     ):
         """Initialize sync database connection pool.
 
@@ -39,6 +179,10 @@ class SyncDatabasePool:
             password: Database password
             min_connections: Minimum pool size
             max_connections: Maximum pool size
+            statement_cache_size: Number of prepared statements cached per connection.
+                Set to 0 when connecting through pgbouncer in transaction
+                pooling mode
+            idle_timeout: Seconds a connection may stay idle before it is closed
         """
         self.host = host
         self.port = port
@@ -47,19 +191,31 @@ class SyncDatabasePool:
         self.password = password
         self.min_connections = min_connections
         self.max_connections = max_connections
-        self._pool: ConnectionPool | None = None
+        self.statement_cache_size = statement_cache_size
+        self.idle_timeout = idle_timeout
+        self._pool: ConnectionPool | _UninitializedPool = _UNINITIALIZED
 
     def initialize(self) -> None:
         """Initialize the sync connection pool."""
         try:
-            conninfo = (
-                f"host={self.host} port={self.port} dbname={self.database} "
-                f"user={self.user} password={self.password}"
+            conninfo = make_conninfo(
+                host=self.host,
+                port=self.port,
+                dbname=self.database,
+                user=self.user,
+                password=self.password,
             )
             self._pool = ConnectionPool(
                 conninfo=conninfo,
                 min_size=self.min_connections,
                 max_size=self.max_connections,
+                max_idle=self.idle_timeout,
+                configure=self._setup_connection,
+                # Initial connections are opened by the pool's worker threads;
+                # give each one a worker (within bounds) so they connect in parallel
+                num_workers=max(
+                    _MIN_NUM_WORKERS, min(self.min_connections, _MAX_NUM_WORKERS)
+                ),
                 open=True,
             )
             logger.info(
@@ -70,9 +226,25 @@ class SyncDatabasePool:
             logger.error(f"Failed to initialize sync database pool: {e}")
             raise
 
+    def _setup_connection(self, conn: Connection) -> None:
+        """Set up each connection's prepared statement cache.
+
+        This is called for each connection in the pool when it's created.
+        """
+        # psycopg's default threshold prepares only repeated queries, so one-off
+        # and multi-statement strings still use the simple query protocol
+        if self.statement_cache_size:
+            conn.prepared_max = self.statement_cache_size
+        else:
+            conn.prepare_threshold = None
+
     def close(self) -> None:
         """Close all connections in the pool."""
-        if self._pool:
+        # A closed pool must not be handed out again by init_sync_database
+        for key, pool in list(_pool_cache.items()):
+            if pool is self:
+                del _pool_cache[key]
+        if self._pool is not _UNINITIALIZED:
             self._pool.close()
             logger.info("Sync database pool closed")
 
@@ -86,9 +258,6 @@ class SyncDatabasePool:
         Raises:
             RuntimeError: If pool is not initialized
         """
-        if not self._pool:
-            raise RuntimeError("Sync database pool not initialized")
-
         with self._pool.connection() as conn:
             yield conn
 
@@ -109,6 +278,30 @@ class SyncDatabasePool:
             with conn.transaction():
                 yield conn
 
+    @contextmanager
+    def pipeline(self) -> Iterator[SyncPipeline]:
+        """Send several queries over one connection in a transaction.
+
+        Yields:
+            A pipeline whose results are available when the block exits
+
+        Example:
+            with db_pool.pipeline() as pipe:
+                for item in items:
+                    pipe.execute("INSERT INTO ...", item)
+                totals = pipe.fetch("SELECT ...")
+            rows = totals.result()
+        """
+        with self.transaction() as conn:
+            pipe = SyncPipeline(conn)
+            try:
+                with conn.pipeline():
+                    yield pipe
+            except BaseException:
+                pipe.discard()
+                raise
+            pipe.flush()
+
     def execute(self, query: str, *args, timeout: float | None = None) -> str:
         """Execute a command (INSERT/UPDATE/DELETE).
 
@@ -120,23 +313,86 @@ class SyncDatabasePool:
         Returns:
             Status string from the query
         """
-        with self.acquire() as conn:
-            cur = conn.execute(query, args if args else None)
-            return cur.statusmessage or ""
+        pool = self._pool
+        conn = pool.getconn()
+        try:
+            with conn:
+                cur = conn.execute(query, args if args else None)
+                return cur.statusmessage or ""
+        finally:
+            pool.putconn(conn)
 
     def executemany(
-        self, query: str, args: list[tuple], timeout: float | None = None
+        self,
+        query: str,
+        args: list[tuple],
+        timeout: float | None = None,
+        batch_size: int = 1000,
     ) -> None:
         """Execute a command multiple times.
 
+        Plain ``INSERT ... VALUES (%s, ...)`` statements are rewritten into
+        multi-row inserts of up to ``batch_size`` rows each; anything else
+        falls back to the cursor's ``executemany``.
+
         Args:
             query: SQL query to execute
             args: List of parameter tuples
             timeout: Query timeout in seconds (not supported in psycopg3 pool)
+            batch_size: Rows per multi-row INSERT
+        """
+        pool = self._pool
+        batches = _multirow_inserts(query, args, batch_size)
+        conn = pool.getconn()
+        try:
+            with conn:
+                cur = conn.cursor()
+                if batches is None:
+                    cur.executemany(query, args)
+                    return
+
+                for statement, params in batches:
+                    cur.execute(statement, params)
+        finally:
+            pool.putconn(conn)
+
+    def copy_records(
+        self,
+        table: str,
+        records: Iterable[tuple],
+        columns: list[str] | None = None,
+        schema_name: str | None = None,
+        timeout: float | None = None,
+    ) -> str:
+        """Bulk load records into a table using COPY.
+
+        Args:
+            table: Target table name
+            records: Iterable of row tuples
+            columns: Target column names (defaults to all columns)
+            schema_name: Schema of the target table
+            timeout: Query timeout in seconds (not supported in psycopg3 pool)
+
+        Returns:
+            Status string from the COPY command
         """
+        if schema_name:
+            target = sql.Identifier(schema_name, table)
+        else:
+            target = sql.Identifier(table)
+        if columns:
+            statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+                target, sql.SQL(", ").join(map(sql.Identifier, columns))
+            )
+        else:
+            statement = sql.SQL("COPY {} FROM STDIN").format(target)
+
         with self.acquire() as conn:
             cur = conn.cursor()
-            cur.executemany(query, args)
+            with cur.copy(statement) as copy:
+                for record in records:
+                    copy.write_row(record)
+            return cur.statusmessage or ""
 
     def fetch(
         self, query: str, *args, timeout: float | None = None
@@ -151,9 +407,14 @@ class SyncDatabasePool:
         Returns:
             List of rows as tuples
         """
-        with self.acquire() as conn:
-            cur = conn.execute(query, args if args else None)
-            return cur.fetchall()
+        pool = self._pool
+        conn = pool.getconn()
+        try:
+            with conn:
+                cur = conn.execute(query, args if args else None)
+                return cur.fetchall()
+        finally:
+            pool.putconn(conn)
 
     def fetchrow(
         self, query: str, *args, timeout: float | None = None
@@ -168,9 +429,14 @@ class SyncDatabasePool:
         Returns:
             Single row or None
         """
-        with self.acquire() as conn:
-            cur = conn.execute(query, args if args else None)
-            return cur.fetchone()
+        pool = self._pool
+        conn = pool.getconn()
+        try:
+            with conn:
+                cur = conn.execute(query, args if args else None)
+                return cur.fetchone()
+        finally:
+            pool.putconn(conn)
 
     def fetchval(
         self, query: str, *args, column: int = 0, timeout: float | None = None
@@ -186,17 +452,77 @@ class SyncDatabasePool:
         Returns:
             Single value from the query result
         """
+        pool = self._pool
+        conn = pool.getconn()
+        try:
+            with conn:
+                cur = conn.execute(query, args if args else None)
+                row = cur.fetchone()
+                if row is None:
+                    return None
+                return row[column]
+        finally:
+            pool.putconn(conn)
+
+    def fetch_json(
+        self, query: str, *args, timeout: float | None = None
+    ) -> bytes:
+        """Execute a query and return its rows as a JSON array.
+
+        The rows are serialized by the server, so the result can be written
+        straight to an HTTP response without building rows first.
+
+        The query is wrapped as a subquery, so it must be valid in ``FROM (...)``;
+        statements such as ``INSERT ... RETURNING`` can't be passed.
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+            timeout: Query timeout in seconds (not supported in psycopg3 pool)
+
+        Returns:
+            UTF-8 encoded JSON array of row objects
+        """
+        wrapped = _JSON_AGG_QUERY.format(query.rstrip().rstrip(";"))
+        with self.acquire() as conn:
+            # Binary results return the bytea payload as-is instead of hex-encoded
+            cur = conn.cursor(binary=True)
+            cur.execute(wrapped, args if args else None)
+            return cur.fetchone()[0]
+
+    def fetch_numpy(
+        self, query: str, *args, timeout: float | None = None
+    ) -> dict[str, Any]:
+        """Execute a query and return its columns as NumPy arrays.
+
+        Integer, float, boolean, date and timestamp columns get native dtypes;
+        other columns, and columns containing NULLs, are object arrays.
+        Requires the ``numpy`` extra.
+
+        Args:
+            query: SQL query to execute
+            *args: Query parameters
+            timeout: Query timeout in seconds (not supported in psycopg3 pool)
+
+        Returns:
+            Mapping of column name to array
+        """
         with self.acquire() as conn:
             cur = conn.execute(query, args if args else None)
-            row = cur.fetchone()
-            if row is None:
-                return None
-            return row[column]
+            rows = cur.fetchall()
+            description = cur.description or []
+
+        names = [col.name for col in description]
+        type_oids = [col.type_code for col in description]
+        return to_numpy_columns(names, type_oids, rows)
 
 
 # Global sync database pool instance
 _sync_db_pool: SyncDatabasePool | None = None
 
+# Initialized pools kept open across init/close cycles, keyed by their settings
+_pool_cache: dict[tuple, SyncDatabasePool] = {}
+
 
 def get_sync_db_pool() -> SyncDatabasePool:
     """Get the global sync database pool instance.
@@ -222,9 +548,16 @@ def init_sync_database(
     password: str,
     min_connections: int = 1,
     max_connections: int = 10,
+    statement_cache_size: int = 1024,
+    idle_timeout: float = 300.0,
+    reuse_pool: bool = True,
 ) -> None:
     """Initialize the global sync database pool.
 
+    With ``reuse_pool``, a pool previously created with the same settings is
+    reused instead of opening new connections, which keeps repeated
+    init/close cycles (e.g. per test) cheap.
+
     Args:
         host: Database host
         port: Database port
@@ -233,9 +566,27 @@ def init_sync_database(
         password: Database password
         min_connections: Minimum pool size
         max_connections: Maximum pool size
+        statement_cache_size: Number of prepared statements cached per connection
+        idle_timeout: Seconds a connection may stay idle before it is closed
+        reuse_pool: Reuse an open pool with the same settings
     """
     global _sync_db_pool
-    _sync_db_pool = SyncDatabasePool(
+    key = (
+        host,
+        port,
+        database,
+        user,
+        password,
+        min_connections,
+        max_connections,
+        statement_cache_size,
+        idle_timeout,
+    )
+    if reuse_pool and key in _pool_cache:
+        _sync_db_pool = _pool_cache[key]
+        return
+
+    pool = SyncDatabasePool(
         host=host,
         port=port,
         database=database,
@@ -243,13 +594,36 @@ def init_sync_database(
         password=password,
         min_connections=min_connections,
         max_connections=max_connections,
+        statement_cache_size=statement_cache_size,
+        idle_timeout=idle_timeout,
     )
-    _sync_db_pool.initialize()
+    pool.initialize()
+    if reuse_pool:
+        _pool_cache[key] = pool
+    _sync_db_pool = pool
+
 
+def close_sync_database(purge: bool = False) -> None:
+    """Close the global sync database pool.
 
-def close_sync_database() -> None:
-    """Close the global sync database pool."""
+    Pools created with ``reuse_pool`` stay open for the next matching
+    ``init_sync_database`` call unless ``purge`` is set.
+
+    Args:
+        purge: Also close every reusable pool
+    """
     global _sync_db_pool
-    if _sync_db_pool:
-        _sync_db_pool.close()
-        _sync_db_pool = None
+    pool, _sync_db_pool = _sync_db_pool, None
+    if pool is not None and pool not in _pool_cache.values():
+        pool.close()
+    if purge:
+        _close_cached_pools()
+
+
+@atexit.register
+def _close_cached_pools() -> None:
+    """Close and forget every reusable pool."""
+    pools = list(_pool_cache.values())
+    _pool_cache.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,184 @@
+"""Test AsyncDatabasePool connection handling without a database."""
+
+import asyncio
+
+import pytest
+from ezpg import async_pool
+from ezpg.async_pool import AsyncDatabasePool
+
+
+class FakeTransaction:
+    """Records the calls made on an asyncpg transaction."""
+
+    def __init__(self, calls: list[str], fail_on: str | None):
+        self._calls = calls
+        self._fail_on = fail_on
+
+    async def start(self):
+        self._record("start")
+
+    async def commit(self):
+        self._record("commit")
+
+    async def rollback(self):
+        self._record("rollback")
+
+    def _record(self, name):
+        self._calls.append(name)
+        if name == self._fail_on:
+            raise ValueError(name)
+
+
+class FakeConnection:
+    def __init__(self, calls: list[str], fail_on: str | None):
+        self._calls = calls
+        self._fail_on = fail_on
+
+    def transaction(self):
+        return FakeTransaction(self._calls, self._fail_on)
+
+
+class FakePool:
+    """Hands out one connection and records acquire/release calls."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.calls: list[str] = []
+        self.conn = FakeConnection(self.calls, fail_on)
+
+    async def acquire(self):
+        self.calls.append("acquire")
+        return self.conn
+
+    async def release(self, conn):
+        assert conn is self.conn
+        self.calls.append("release")
+
+
+def make_pool(**kwargs) -> AsyncDatabasePool:
+    return AsyncDatabasePool(
+        host="localhost",
+        port=5432,
+        database="test",
+        user="test",
+        password="test",
+        **kwargs,
+    )
+
+
+class TestInitializeLoop:
+    def test_rejects_loop_other_than_running(self):
+        """initialize() raises instead of silently binding to the running loop."""
+        other_loop = asyncio.new_event_loop()
+        try:
+            pool = make_pool(loop=other_loop)
+            with pytest.raises(RuntimeError, match="loop="):
+                asyncio.run(pool.initialize())
+        finally:
+            other_loop.close()
+
+
+class TestConnectionContexts:
+    def test_acquire_releases_on_error(self):
+        """The connection goes back to the pool even if the block raises."""
+        fake = FakePool()
+        pool = make_pool()
+        pool._pool = fake
+
+        async def run():
+            async with pool.acquire() as conn:
+                assert conn is fake.conn
+                raise KeyError("body")
+
+        with pytest.raises(KeyError):
+            asyncio.run(run())
+        assert fake.calls == ["acquire", "release"]
+
+    def test_transaction_commits_on_clean_exit(self):
+        """A block that exits normally commits, then releases."""
+        fake = FakePool()
+        pool = make_pool()
+        pool._pool = fake
+
+        async def run():
+            async with pool.transaction() as conn:
+                assert conn is fake.conn
+
+        asyncio.run(run())
+        assert fake.calls == ["acquire", "start", "commit", "release"]
+
+    def test_transaction_rolls_back_when_body_raises(self):
+        """An exception in the block rolls back, releases and propagates."""
+        fake = FakePool()
+        pool = make_pool()
+        pool._pool = fake
+
+        async def run():
+            async with pool.transaction():
+                raise KeyError("body")
+
+        with pytest.raises(KeyError):
+            asyncio.run(run())
+        assert fake.calls == ["acquire", "start", "rollback", "release"]
+
+    def test_transaction_releases_when_start_fails(self):
+        """A failed BEGIN releases the connection without running the block."""
+        fake = FakePool(fail_on="start")
+        pool = make_pool()
+        pool._pool = fake
+
+        async def run():
+            async with pool.transaction():
+                pytest.fail("block ran without a transaction")
+
+        with pytest.raises(ValueError, match="start"):
+            asyncio.run(run())
+        assert fake.calls == ["acquire", "start", "release"]
+
+    def test_transaction_releases_when_commit_fails(self):
+        """A failed COMMIT still releases the connection and raises."""
+        fake = FakePool(fail_on="commit")
+        pool = make_pool()
+        pool._pool = fake
+
+        async def run():
+            async with pool.transaction():
+                pass
+
+        with pytest.raises(ValueError, match="commit"):
+            asyncio.run(run())
+        assert fake.calls == ["acquire", "start", "commit", "release"]
+
+
+class TestGetAsyncDbPool:
+    @pytest.fixture
+    def foreign_pool(self, monkeypatch):
+        other_loop = asyncio.new_event_loop()
+        pool = make_pool()
+        pool._loop = other_loop
+        monkeypatch.setattr(async_pool, "_async_db_pool", pool)
+        yield pool
+        other_loop.close()
+
+    def test_rejects_pool_from_another_loop(self, foreign_pool):
+        """A pool bound to another loop can't be fetched inside a running loop."""
+
+        async def get():
+            return async_pool.get_async_db_pool()
+
+        with pytest.raises(RuntimeError, match="different event loop"):
+            asyncio.run(get())
+
+    def test_returns_pool_outside_a_loop(self, foreign_pool):
+        """Without a running loop there is nothing to compare against."""
+        assert async_pool.get_async_db_pool() is foreign_pool
+
+    def test_returns_pool_on_its_own_loop(self, monkeypatch):
+        """A pool fetched on the loop it was initialized on is returned."""
+        pool = make_pool()
+        monkeypatch.setattr(async_pool, "_async_db_pool", pool)
+
+        async def get():
+            pool._loop = asyncio.get_running_loop()
+            return async_pool.get_async_db_pool()
+
+        assert asyncio.run(get()) is pool
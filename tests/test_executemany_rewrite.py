@@ -0,0 +1,64 @@
+"""Test the sync pool's multi-row INSERT rewrite without a database."""
+
+from ezpg.sync_pool import _MAX_QUERY_PARAMS, _multirow_inserts
+
+
+class TestMultirowInserts:
+    """Verify which queries are rewritten and how rows are batched."""
+
+    def test_plain_insert_is_rewritten(self):
+        """A single-row INSERT should become one multi-row INSERT."""
+        batches = _multirow_inserts(
+            "INSERT INTO t (a, b) VALUES (%s, %s)", [(1, 2), (3, 4), (5, 6)], 1000
+        )
+
+        assert list(batches) == [
+            (
+                "INSERT INTO t (a, b) VALUES (%s, %s),(%s, %s),(%s, %s)",
+                [1, 2, 3, 4, 5, 6],
+            )
+        ]
+
+    def test_batch_size_splits_statements(self):
+        """Rows beyond batch_size should go into further statements."""
+        batches = _multirow_inserts(
+            "insert into t(a) values(%s);", [(1,), (2,), (3,)], 2
+        )
+
+        assert list(batches) == [
+            ("insert into t(a) values(%s),(%s)", [1, 2]),
+            ("insert into t(a) values(%s)", [3]),
+        ]
+
+    def test_batches_respect_parameter_limit(self):
+        """No statement should exceed PostgreSQL's bind parameter limit."""
+        width = 7
+        row = "(" + ", ".join(["%s"] * width) + ")"
+        rows = [tuple(range(width))] * 20000
+
+        batches = list(_multirow_inserts(f"INSERT INTO t VALUES {row}", rows, 20000))
+
+        assert all(len(params) <= _MAX_QUERY_PARAMS for _, params in batches)
+        assert len(batches[0][1]) == (_MAX_QUERY_PARAMS // width) * width
+        assert sum(len(params) for _, params in batches) == len(rows) * width
+        for statement, params in batches:
+            assert statement.count("%s") == len(params)
+
+    def test_returning_falls_back(self):
+        """INSERT ... RETURNING should not be rewritten."""
+        query = "INSERT INTO t (a) VALUES (%s) RETURNING id"
+        assert _multirow_inserts(query, [(1,)], 1000) is None
+
+    def test_on_conflict_falls_back(self):
+        """INSERT ... ON CONFLICT should not be rewritten."""
+        query = "INSERT INTO t (a) VALUES (%s) ON CONFLICT DO NOTHING"
+        assert _multirow_inserts(query, [(1,)], 1000) is None
+
+    def test_placeholders_outside_values_fall_back(self):
+        """Placeholders before the VALUES row should prevent the rewrite."""
+        query = "INSERT INTO t (a) SELECT %s UNION ALL VALUES (%s)"
+        assert _multirow_inserts(query, [(1, 2)], 1000) is None
+
+    def test_other_statements_fall_back(self):
+        """Non-INSERT statements should not be rewritten."""
+        assert _multirow_inserts("UPDATE t SET a = %s", [(1,)], 1000) is None
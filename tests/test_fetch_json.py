@@ -0,0 +1,78 @@
+"""Test the SQL fetch_json sends without a database."""
+
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from ezpg.async_pool import AsyncDatabasePool
+from ezpg.sync_pool import SyncDatabasePool
+
+SETTINGS = {
+    "host": "localhost",
+    "port": 5432,
+    "database": "test",
+    "user": "test",
+    "password": "test",
+}
+
+QUERIES = [
+    "SELECT * FROM users -- active only",
+    "SELECT * FROM users;",
+    "SELECT * FROM users ;\n",
+]
+
+
+class FakeCursor:
+    def __init__(self, sent: list[str]):
+        self._sent = sent
+
+    def execute(self, query, params=None):
+        self._sent.append(query)
+
+    def fetchone(self):
+        return (b"[]",)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    def cursor(self, binary=False):
+        return FakeCursor(self.sent)
+
+
+def assert_wrapped(sql: str) -> None:
+    # The closing paren must survive a trailing line comment
+    assert sql.startswith("SELECT convert_to(")
+    assert "\n) AS t" in sql
+    assert ";" not in sql
+
+
+class TestFetchJsonWrapping:
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_async_wraps_query_as_subquery(self, monkeypatch, query):
+        """Trailing comments and semicolons don't break the async wrapper."""
+        sent = []
+
+        async def fetchval(self, query, *args, timeout=None):
+            sent.append(query)
+            return b"[]"
+
+        monkeypatch.setattr(AsyncDatabasePool, "fetchval", fetchval)
+        pool = AsyncDatabasePool(**SETTINGS)
+        assert asyncio.run(pool.fetch_json(query)) == b"[]"
+        assert_wrapped(sent[0])
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_sync_wraps_query_as_subquery(self, monkeypatch, query):
+        """Trailing comments and semicolons don't break the sync wrapper."""
+        conn = FakeConnection()
+
+        @contextmanager
+        def acquire(self):
+            yield conn
+
+        monkeypatch.setattr(SyncDatabasePool, "acquire", acquire)
+        pool = SyncDatabasePool(**SETTINGS)
+        assert pool.fetch_json(query) == b"[]"
+        assert_wrapped(conn.sent[0])
@@ -13,11 +13,15 @@ SHARED_METHODS = [
     "close",
     "acquire",
     "transaction",
+    "pipeline",
     "execute",
     "executemany",
+    "copy_records",
     "fetch",
     "fetchrow",
     "fetchval",
+    "fetch_json",
+    "fetch_numpy",
 ]
 
 # Methods that are async-only (no sync equivalent expected)
@@ -25,6 +29,12 @@ ASYNC_ONLY_METHODS = [
     "create_listener",  # LISTEN/NOTIFY is inherently async
 ]
 
+# __init__ parameters that only apply to the asyncpg driver
+ASYNC_ONLY_INIT_PARAMS = [
+    "binary_json",  # asyncpg codecs choose the JSONB wire format per connection
+    "loop",  # the sync pool has no event loop
+]
+
 
 class TestInterfaceParity:
     """Verify that async and sync pool classes have matching interfaces."""
@@ -43,7 +53,9 @@ class TestInterfaceParity:
         async_sig = inspect.signature(AsyncDatabasePool.__init__)
         sync_sig = inspect.signature(SyncDatabasePool.__init__)
 
-        async_params = list(async_sig.parameters.keys())
+        async_params = [
+            p for p in async_sig.parameters.keys() if p not in ASYNC_ONLY_INIT_PARAMS
+        ]
         sync_params = list(sync_sig.parameters.keys())
 
         assert async_params == sync_params, (
@@ -86,3 +98,16 @@ class TestInterfaceParity:
             assert not hasattr(SyncDatabasePool, method), (
                 f"{method} exists on SyncDatabasePool but is listed as async-only"
             )
+
+    def test_async_only_init_params_documented(self):
+        """Async-only __init__ parameters should actually exist on AsyncDatabasePool."""
+        async_params = inspect.signature(AsyncDatabasePool.__init__).parameters
+        sync_params = inspect.signature(SyncDatabasePool.__init__).parameters
+
+        for param in ASYNC_ONLY_INIT_PARAMS:
+            assert param in async_params, (
+                f"ASYNC_ONLY_INIT_PARAMS lists {param} but it doesn't exist"
+            )
+            assert param not in sync_params, (
+                f"{param} exists on SyncDatabasePool but is listed as async-only"
+            )
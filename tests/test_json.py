@@ -0,0 +1,40 @@
+"""Test the JSON codecs shared by both pools."""
+
+import pytest
+from ezpg._json import json_dumps, json_loads
+
+WIDE_INTS = [2**64, -(2**63) - 1, 123456789012345678901234567890]
+
+
+class TestJsonLoads:
+    @pytest.mark.parametrize("value", WIDE_INTS)
+    def test_wide_integers_keep_exact_value(self, value):
+        """Integers orjson would round to floats decode exactly."""
+        text = f'{{"n": [{value}]}}'
+        for data in (text, text.encode(), memoryview(text.encode())):
+            assert json_loads(data) == {"n": [value]}
+
+    def test_regular_values(self):
+        """Ordinary documents, including 19-digit strings, decode unchanged."""
+        data = b'{"id": 9223372036854775807, "s": "1234567890123456789", "f": 1.5}'
+        assert json_loads(data) == {
+            "id": 2**63 - 1,
+            "s": "1234567890123456789",
+            "f": 1.5,
+        }
+
+
+class TestJsonDumps:
+    @pytest.mark.parametrize("value", WIDE_INTS)
+    def test_wide_integers_round_trip(self, value):
+        """Integers orjson rejects are encoded by the stdlib instead."""
+        assert json_loads(json_dumps({"n": value})) == {"n": value}
+
+    def test_non_str_keys_and_nan(self):
+        """Non-string keys become strings and NaN becomes null."""
+        assert json_dumps({1: float("nan")}) == b'{"1":null}'
+
+    def test_unsupported_type_raises(self):
+        """Values neither encoder supports still raise TypeError."""
+        with pytest.raises(TypeError):
+            json_dumps({"x": object()})
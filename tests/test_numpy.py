@@ -0,0 +1,116 @@
+"""Test column-oriented NumPy conversion of query results."""
+
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from ezpg._numpy import to_numpy_columns
+from ezpg.async_pool import AsyncDatabasePool
+
+np = pytest.importorskip("numpy")
+
+INT4_OID = 23
+FLOAT8_OID = 701
+DATE_OID = 1082
+TIMESTAMP_OID = 1114
+TEXT_OID = 25
+
+
+class TestToNumpyColumns:
+    """Verify dtype selection and fallbacks of to_numpy_columns."""
+
+    def test_native_dtypes(self):
+        """Numeric columns should get their native dtype."""
+        columns = to_numpy_columns(
+            ["id", "score"], [INT4_OID, FLOAT8_OID], [(1, 1.5), (2, 2.5)]
+        )
+
+        assert columns["id"].dtype == np.int32
+        assert columns["id"].tolist() == [1, 2]
+        assert columns["score"].dtype == np.float64
+        assert columns["score"].tolist() == [1.5, 2.5]
+
+    def test_date_and_timestamp_dtypes(self):
+        """Date and timestamp columns should become datetime64 arrays."""
+        rows = [(datetime.date(2024, 1, 2), datetime.datetime(2024, 1, 2, 3, 4, 5, 6))]
+        columns = to_numpy_columns(["day", "at"], [DATE_OID, TIMESTAMP_OID], rows)
+
+        assert columns["day"].dtype == np.dtype("datetime64[D]")
+        assert columns["day"][0] == np.datetime64("2024-01-02")
+        assert columns["at"].dtype == np.dtype("datetime64[us]")
+        assert columns["at"][0] == np.datetime64("2024-01-02T03:04:05.000006")
+
+    def test_nulls_fall_back_to_object(self):
+        """Columns containing NULLs should become object arrays."""
+        columns = to_numpy_columns(["id"], [INT4_OID], [(1,), (None,)])
+
+        assert columns["id"].dtype == object
+        assert columns["id"].tolist() == [1, None]
+
+    def test_unmapped_types_are_object(self):
+        """Columns without a native dtype should become object arrays."""
+        columns = to_numpy_columns(["name"], [TEXT_OID], [("a",), ("b",)])
+
+        assert columns["name"].dtype == object
+        assert columns["name"].tolist() == ["a", "b"]
+
+    def test_zero_rows(self):
+        """An empty result should still produce typed, empty columns."""
+        columns = to_numpy_columns(["id", "name"], [INT4_OID, TEXT_OID], [])
+
+        assert columns["id"].dtype == np.int32
+        assert len(columns["id"]) == 0
+        assert columns["name"].dtype == object
+        assert len(columns["name"]) == 0
+
+
+class FakeStatement:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def fetch(self, *args):
+        return self._rows
+
+    def get_attributes(self):
+        return [SimpleNamespace(name="id", type=SimpleNamespace(oid=INT4_OID))]
+
+
+class FakeConnection:
+    """Records how fetch_numpy prepares its statement."""
+
+    def __init__(self):
+        self.prepared: list[dict] = []
+
+    async def _prepare(self, query, **kwargs):
+        self.prepared.append(kwargs)
+        return FakeStatement([(1,), (2,)])
+
+
+class FakePool:
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def acquire(self):
+        return self._conn
+
+    async def release(self, conn):
+        pass
+
+
+class TestAsyncFetchNumpy:
+    """Verify how the async pool prepares fetch_numpy queries."""
+
+    def test_uses_statement_cache(self):
+        """The statement should come from the connection's cache, like fetch()."""
+        conn = FakeConnection()
+        pool = AsyncDatabasePool(
+            host="localhost", port=5432, database="test", user="test", password="test"
+        )
+        pool._pool = FakePool(conn)
+
+        columns = asyncio.run(pool.fetch_numpy("SELECT id FROM t", timeout=5))
+
+        assert conn.prepared == [{"use_cache": True}]
+        assert columns["id"].dtype == np.int32
+        assert columns["id"].tolist() == [1, 2]
@@ -0,0 +1,166 @@
+"""Test pipeline query grouping and result handles without a database."""
+
+import asyncio
+
+import pytest
+from ezpg._pipeline import PipelineResult
+from ezpg.async_pool import AsyncPipeline
+from ezpg.sync_pool import SyncPipeline
+
+
+class FakeAsyncConnection:
+    """Records the calls AsyncPipeline makes on an asyncpg connection."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.calls: list[tuple] = []
+        self.fail_on = fail_on
+
+    async def execute(self, query, *args):
+        self._record("execute", query, args)
+
+    async def executemany(self, query, args):
+        self._record("executemany", query, args)
+
+    async def fetch(self, query, *args):
+        self._record("fetch", query, args)
+        return [("row", query)]
+
+    def _record(self, method, query, args):
+        if query == self.fail_on:
+            raise ValueError(query)
+        self.calls.append((method, query, args))
+
+
+class FakeCursor:
+    """Stands in for a psycopg cursor with buffered rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeSyncConnection:
+    """Records the calls SyncPipeline makes on a psycopg connection."""
+
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    def execute(self, query, params):
+        self.calls.append((query, params))
+        return FakeCursor([("row", query)])
+
+
+class TestAsyncPipeline:
+    """Verify AsyncPipeline batching and result delivery."""
+
+    def test_consecutive_executes_are_grouped(self):
+        """Runs of the same execute() query should become one executemany()."""
+        conn = FakeAsyncConnection()
+        pipe = AsyncPipeline(conn)
+        pipe.execute("INSERT a", 1)
+        pipe.execute("INSERT a", 2)
+        pipe.execute("INSERT a", 3)
+        pipe.execute("INSERT b", 4)
+        pipe.execute("INSERT a", 5)
+
+        asyncio.run(pipe.flush())
+
+        assert conn.calls == [
+            ("executemany", "INSERT a", [(1,), (2,), (3,)]),
+            ("execute", "INSERT b", (4,)),
+            ("execute", "INSERT a", (5,)),
+        ]
+
+    def test_parameterless_executes_are_not_grouped(self):
+        """Repeated queries without args should keep using execute()."""
+        conn = FakeAsyncConnection()
+        pipe = AsyncPipeline(conn)
+        pipe.execute("UPDATE a; UPDATE b")
+        pipe.execute("UPDATE a; UPDATE b")
+
+        asyncio.run(pipe.flush())
+
+        assert conn.calls == [
+            ("execute", "UPDATE a; UPDATE b", ()),
+            ("execute", "UPDATE a; UPDATE b", ()),
+        ]
+
+    def test_fetch_breaks_a_run_and_keeps_order(self):
+        """A fetch() between executes should end the run and run in order."""
+        conn = FakeAsyncConnection()
+        pipe = AsyncPipeline(conn)
+        pipe.execute("INSERT a", 1)
+        pipe.execute("INSERT a", 2)
+        result = pipe.fetch("SELECT", 0)
+        pipe.execute("INSERT a", 3)
+
+        asyncio.run(pipe.flush())
+
+        assert conn.calls == [
+            ("executemany", "INSERT a", [(1,), (2,)]),
+            ("fetch", "SELECT", (0,)),
+            ("execute", "INSERT a", (3,)),
+        ]
+        assert result.result() == [("row", "SELECT")]
+
+    def test_failure_discards_pending_results(self):
+        """Results queued after a failing query should report the discard."""
+        conn = FakeAsyncConnection(fail_on="INSERT a")
+        pipe = AsyncPipeline(conn)
+        first = pipe.fetch("SELECT 1")
+        pipe.execute("INSERT a", 1)
+        second = pipe.fetch("SELECT 2")
+
+        with pytest.raises(ValueError):
+            asyncio.run(pipe.flush())
+
+        assert first.result() == [("row", "SELECT 1")]
+        with pytest.raises(RuntimeError, match="discarded"):
+            second.result()
+
+
+class TestSyncPipeline:
+    """Verify SyncPipeline sends immediately and collects results on flush."""
+
+    def test_results_available_after_flush(self):
+        """fetch() rows should be collected when the pipeline is flushed."""
+        conn = FakeSyncConnection()
+        pipe = SyncPipeline(conn)
+        pipe.execute("INSERT a", 1)
+        result = pipe.fetch("SELECT")
+
+        assert conn.calls == [("INSERT a", (1,)), ("SELECT", None)]
+        assert not result.done()
+
+        pipe.flush()
+
+        assert result.result() == [("row", "SELECT")]
+
+    def test_discard(self):
+        """Discarded fetches should report that their results never arrived."""
+        pipe = SyncPipeline(FakeSyncConnection())
+        result = pipe.fetch("SELECT")
+
+        pipe.discard()
+
+        with pytest.raises(RuntimeError, match="discarded"):
+            result.result()
+
+
+class TestPipelineResult:
+    """Verify that reading a result early fails instead of hanging."""
+
+    def test_result_before_flush_raises(self):
+        """result() inside the pipeline block should raise."""
+        with pytest.raises(RuntimeError, match="after the pipeline block exits"):
+            PipelineResult().result()
+
+    def test_await_raises(self):
+        """Awaiting a result should raise rather than wait for the flush."""
+        async def read():
+            return await PipelineResult()
+
+        with pytest.raises(RuntimeError, match="can't be awaited"):
+            asyncio.run(read())
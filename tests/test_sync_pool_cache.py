@@ -0,0 +1,85 @@
+"""Test reuse of sync pools across init/close cycles without a database."""
+
+import pytest
+from ezpg import sync_pool
+from ezpg.sync_pool import SyncDatabasePool
+
+
+class FakeConnectionPool:
+    """Stands in for psycopg_pool.ConnectionPool."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+SETTINGS = {
+    "host": "localhost",
+    "port": 5432,
+    "database": "test",
+    "user": "test",
+    "password": "test",
+}
+
+
+@pytest.fixture(autouse=True)
+def fake_initialize(monkeypatch):
+    def initialize(self):
+        self._pool = FakeConnectionPool()
+
+    monkeypatch.setattr(SyncDatabasePool, "initialize", initialize)
+    monkeypatch.setattr(sync_pool, "_sync_db_pool", None)
+    monkeypatch.setattr(sync_pool, "_pool_cache", {})
+
+
+class TestPoolCache:
+    def test_reuses_pool_with_same_settings(self):
+        """A matching init after close returns the same open pool."""
+        sync_pool.init_sync_database(**SETTINGS)
+        first = sync_pool.get_sync_db_pool()
+        sync_pool.close_sync_database()
+        assert not first._pool.closed
+
+        sync_pool.init_sync_database(**SETTINGS)
+        assert sync_pool.get_sync_db_pool() is first
+
+    def test_different_settings_get_new_pool(self):
+        """Pools are only shared between identical settings."""
+        sync_pool.init_sync_database(**SETTINGS)
+        first = sync_pool.get_sync_db_pool()
+        sync_pool.close_sync_database()
+
+        sync_pool.init_sync_database(**SETTINGS, max_connections=20)
+        assert sync_pool.get_sync_db_pool() is not first
+
+    def test_reuse_pool_false_closes_on_close(self):
+        """Without reuse_pool the pool is neither cached nor kept open."""
+        sync_pool.init_sync_database(**SETTINGS, reuse_pool=False)
+        pool = sync_pool.get_sync_db_pool()
+        assert sync_pool._pool_cache == {}
+
+        sync_pool.close_sync_database()
+        assert pool._pool.closed
+
+    def test_purge_closes_cached_pools(self):
+        """purge=True closes and forgets every cached pool."""
+        sync_pool.init_sync_database(**SETTINGS)
+        pool = sync_pool.get_sync_db_pool()
+
+        sync_pool.close_sync_database(purge=True)
+        assert pool._pool.closed
+        assert sync_pool._pool_cache == {}
+
+    def test_directly_closed_pool_is_not_reused(self):
+        """Closing the pool itself evicts it from the cache."""
+        sync_pool.init_sync_database(**SETTINGS)
+        first = sync_pool.get_sync_db_pool()
+        first.close()
+        sync_pool.close_sync_database()
+
+        sync_pool.init_sync_database(**SETTINGS)
+        second = sync_pool.get_sync_db_pool()
+        assert second is not first
+        assert not second._pool.closed
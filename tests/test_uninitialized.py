@@ -0,0 +1,101 @@
+"""Test that every pool entry point fails clearly before initialize()."""
+
+import asyncio
+
+import pytest
+from ezpg.async_pool import AsyncDatabasePool
+from ezpg.sync_pool import SyncDatabasePool
+
+SETTINGS = {
+    "host": "localhost",
+    "port": 5432,
+    "database": "test",
+    "user": "test",
+    "password": "test",
+}
+
+
+async def async_acquire(pool):
+    async with pool.acquire():
+        pass
+
+
+async def async_transaction(pool):
+    async with pool.transaction():
+        pass
+
+
+async def async_pipeline(pool):
+    async with pool.pipeline():
+        pass
+
+
+ASYNC_CALLS = {
+    "acquire": async_acquire,
+    "transaction": async_transaction,
+    "pipeline": async_pipeline,
+    "execute": lambda pool: pool.execute("SELECT 1"),
+    "executemany": lambda pool: pool.executemany("SELECT $1", [(1,)]),
+    "copy_records": lambda pool: pool.copy_records("t", [(1,)]),
+    "fetch": lambda pool: pool.fetch("SELECT 1"),
+    "fetchrow": lambda pool: pool.fetchrow("SELECT 1"),
+    "fetchval": lambda pool: pool.fetchval("SELECT 1"),
+    "fetch_json": lambda pool: pool.fetch_json("SELECT 1"),
+    "fetch_numpy": lambda pool: pool.fetch_numpy("SELECT 1"),
+}
+
+
+def sync_acquire(pool):
+    with pool.acquire():
+        pass
+
+
+def sync_transaction(pool):
+    with pool.transaction():
+        pass
+
+
+def sync_pipeline(pool):
+    with pool.pipeline():
+        pass
+
+
+SYNC_CALLS = {
+    "acquire": sync_acquire,
+    "transaction": sync_transaction,
+    "pipeline": sync_pipeline,
+    "execute": lambda pool: pool.execute("SELECT 1"),
+    "executemany": lambda pool: pool.executemany("SELECT %s", [(1,)]),
+    "copy_records": lambda pool: pool.copy_records("t", [(1,)]),
+    "fetch": lambda pool: pool.fetch("SELECT 1"),
+    "fetchrow": lambda pool: pool.fetchrow("SELECT 1"),
+    "fetchval": lambda pool: pool.fetchval("SELECT 1"),
+    "fetch_json": lambda pool: pool.fetch_json("SELECT 1"),
+    "fetch_numpy": lambda pool: pool.fetch_numpy("SELECT 1"),
+}
+
+
+class TestUninitializedAsyncPool:
+    @pytest.mark.parametrize("call", ASYNC_CALLS.values(), ids=ASYNC_CALLS.keys())
+    def test_raises_not_initialized(self, call):
+        """Each entry point raises RuntimeError instead of touching a pool."""
+        pool = AsyncDatabasePool(**SETTINGS)
+        with pytest.raises(RuntimeError, match="not initialized"):
+            asyncio.run(call(pool))
+
+    def test_close_is_a_no_op(self):
+        """Closing a pool that was never initialized does nothing."""
+        asyncio.run(AsyncDatabasePool(**SETTINGS).close())
+
+
+class TestUninitializedSyncPool:
+    @pytest.mark.parametrize("call", SYNC_CALLS.values(), ids=SYNC_CALLS.keys())
+    def test_raises_not_initialized(self, call):
+        """Each entry point raises RuntimeError instead of touching a pool."""
+        pool = SyncDatabasePool(**SETTINGS)
+        with pytest.raises(RuntimeError, match="not initialized"):
+            call(pool)
+
+    def test_close_is_a_no_op(self):
+        """Closing a pool that was never initialized does nothing."""
+        SyncDatabasePool(**SETTINGS).close()